@@ -1,7 +1,6 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import os
+import numpy as np
+import io
 from datetime import datetime, timedelta
 from gantt_prototype import GanttPrototype
 
@@ -24,18 +23,8 @@ if 'current_filter' not in st.session_state:
 
 # Funzione per aggiornare il grafico Gantt
 def update_gantt_chart():
-    # Crea la directory per i grafici se non esiste
-    os.makedirs('gantt_charts', exist_ok=True)
-    
-    # Genera il grafico Gantt
-    if st.session_state.current_filter:
-        chart_path = f"gantt_charts/gantt_{st.session_state.current_filter.replace(' ', '_')}.png"
-        st.session_state.gantt.generate_gantt(chart_path, filter_person=st.session_state.current_filter)
-    else:
-        chart_path = "gantt_charts/gantt_completo.png"
-        st.session_state.gantt.generate_gantt(chart_path)
-    
-    return chart_path
+    # Genera il grafico Gantt in memoria come array RGBA
+    return st.session_state.gantt.render_gantt(filter_person=st.session_state.current_filter)
 
 # Layout dell'applicazione con due colonne
 col1, col2 = st.columns([1, 2])
@@ -53,16 +42,15 @@ with col1:
         data_fine = st.date_input("Data Fine", value=datetime.now() + timedelta(days=7))
         persona = st.text_input("Persona di Riferimento")
         
-        stati = ['Non iniziato', 'In corso', 'Completato', 'In ritardo', 'In pausa']
-        stato = st.selectbox("Stato", stati)
+        stato = st.selectbox("Stato", GanttPrototype.STATI)
         
         submitted = st.form_submit_button("Aggiungi Attività")
         
         if submitted:
             if nome_attivita and persona:
-                # Converti date in datetime
-                data_inizio_dt = pd.to_datetime(data_inizio)
-                data_fine_dt = pd.to_datetime(data_fine)
+                # Converti le date in np.datetime64
+                data_inizio_dt = np.datetime64(data_inizio, 'D')
+                data_fine_dt = np.datetime64(data_fine, 'D')
                 
                 # Verifica che la data di fine sia successiva alla data di inizio
                 if data_fine_dt <= data_inizio_dt:
@@ -78,12 +66,8 @@ with col1:
     st.subheader("Elenco Attività")
     
     if not st.session_state.gantt.df.empty:
-        # Formatta le date per la visualizzazione
-        df_display = st.session_state.gantt.df.copy()
-        df_display['Data_Inizio'] = df_display['Data_Inizio'].dt.strftime('%d/%m/%Y')
-        df_display['Data_Fine'] = df_display['Data_Fine'].dt.strftime('%d/%m/%Y')
-        
-        st.dataframe(df_display)
+        # Le date sono già formattate per la visualizzazione
+        st.dataframe(st.session_state.gantt.display_df)
         
         # Form per eliminare un'attività
         with st.form("delete_activity_form"):
@@ -105,17 +89,18 @@ with col1:
     # Salva in Excel
     if not st.session_state.gantt.df.empty:
         if st.button("Salva in Excel"):
-            file_path = st.session_state.gantt.save_to_excel("gantt_prototype.xlsx")
-            st.success(f"Dati salvati in {file_path}")
+            # Genera il file Excel in memoria, senza passare dal disco
+            buf = io.BytesIO()
+            st.session_state.gantt.save_to_excel(buf)
+            st.success("File Excel pronto per il download")
             
             # Offri il download del file
-            with open(file_path, "rb") as file:
-                st.download_button(
-                    label="Scarica file Excel",
-                    data=file,
-                    file_name="gantt_prototype.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                )
+            st.download_button(
+                label="Scarica file Excel",
+                data=buf.getvalue(),
+                file_name="gantt_prototype.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            )
 
 # Colonna 2: Visualizzazione del Gantt
 with col2:
@@ -133,8 +118,8 @@ with col2:
         
         # Genera e visualizza il grafico Gantt
         if len(st.session_state.gantt.df) > 0:
-            chart_path = update_gantt_chart()
-            st.image(chart_path)
+            chart_image = update_gantt_chart()
+            st.image(chart_image)
         else:
             st.info("Aggiungi attività per visualizzare il diagramma di Gantt.")
     else:
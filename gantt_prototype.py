@@ -1,12 +1,38 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-from datetime import datetime, timedelta
 import numpy as np
 import os
-from matplotlib.patches import Patch
 
 class GanttPrototype:
+    COLUMNS = ['ID', 'Nome_Attività', 'Data_Inizio', 'Data_Fine', 'Persona_Riferimento', 'Stato']
+    STATI = ['Non iniziato', 'In corso', 'Completato', 'In ritardo', 'In pausa']
+    
+    # Colori per gli stati
+    COLORI_STATI = {
+        'Non iniziato': 'lightgrey',
+        'In corso': 'lightblue',
+        'Completato': 'lightgreen',
+        'In ritardo': 'salmon',
+        'In pausa': 'yellow'
+    }
+    # Colori indicizzati dal codice dello stato; l'ultimo (codice -1) è per gli stati mancanti
+    _COLOR_LUT = np.array([*map(COLORI_STATI.get, STATI), 'lightgrey'], dtype=object)
+    
+    # Voci della legenda, create al primo disegno e condivise tra le istanze
+    LEGEND_ELEMENTS = None
+    
+    # Tipi degli array interni, uno per colonna
+    STORAGE_DTYPES = {
+        'ID': 'i4',
+        'Nome_Attività': object,
+        'Data_Inizio': 'i4',  # giorni dal 1970-01-01, NAT_DAY se mancante
+        'Data_Fine': 'i4',
+        'Persona_Riferimento': 'i4',  # codice nella lista delle persone
+        'Stato': 'i1'  # codice in STATI, -1 se mancante
+    }
+    STATO_DTYPE = pd.CategoricalDtype(STATI)
+    NAT_DAY = np.iinfo(np.int32).min  # data mancante (NaT)
+    INITIAL_CAPACITY = 16
+
     def __init__(self, excel_file=None):
         """
         Inizializza il prototipo di Gantt.
@@ -15,6 +41,10 @@ class GanttPrototype:
             excel_file: Percorso del file Excel esistente (opzionale)
         """
         self.excel_file = excel_file
+        self._fig = None
+        self._ax = None
+        self._canvas = None
+        self._version = 0
         
         # Crea un DataFrame vuoto per le attività se non viene fornito un file
         if excel_file and os.path.exists(excel_file):
@@ -25,11 +55,153 @@ class GanttPrototype:
         else:
             self.initialize_dataframe()
     
-    def initialize_dataframe(self):
-        """Inizializza un DataFrame vuoto con la struttura corretta"""
-        self.df = pd.DataFrame(columns=[
-            'ID', 'Nome_Attività', 'Data_Inizio', 'Data_Fine', 'Persona_Riferimento', 'Stato'
-        ])
+    def initialize_dataframe(self, capacity=INITIAL_CAPACITY):
+        """Inizializza un archivio vuoto con la struttura corretta"""
+        self._cols = {col: np.empty(capacity, dtype=dtype)
+                      for col, dtype in self.STORAGE_DTYPES.items()}
+        self._cap = capacity
+        self._n = 0
+        self._persons = []
+        self._person_codes = {}
+        self._next_id = 1
+        self._invalidate()
+    
+    def _invalidate(self):
+        """Invalida i dati memorizzati dopo una modifica delle righe"""
+        self._version += 1
+        self._df_cache = None
+        self._display_cache = None
+        self._persons_cache = None
+        self._render_cache = {}
+    
+    def _grow(self):
+        """Raddoppia la capacità degli array interni"""
+        self._cap = max(2 * self._cap, self.INITIAL_CAPACITY)
+        for col, values in self._cols.items():
+            self._cols[col] = np.resize(values, self._cap)
+    
+    def _person_code(self, persona):
+        """Restituisce il codice della persona, registrandola se nuova (-1 se mancante)"""
+        if pd.api.types.is_scalar(persona) and pd.isna(persona):
+            return -1
+        code = self._person_codes.get(persona)
+        if code is None:
+            code = len(self._persons)
+            self._persons.append(persona)
+            self._person_codes[persona] = code
+        return code
+    
+    def _valid_stato(self, stato):
+        """Verifica che lo stato sia uno di STATI oppure mancante"""
+        return (pd.api.types.is_scalar(stato) and pd.isna(stato)) or stato in self.STATI
+    
+    def _encode(self, col, value):
+        """Converte un valore nel formato dell'array interno della colonna"""
+        if col == 'Persona_Riferimento':
+            return self._person_code(value)
+        if col == 'Stato':
+            return self.STATI.index(value) if value in self.STATI else -1
+        if col in ('Data_Inizio', 'Data_Fine'):
+            return self._to_day(value)
+        return value
+    
+    @classmethod
+    def _to_day(cls, value):
+        """Converte una singola data in giorni dal 1970-01-01, con NAT_DAY se mancante"""
+        # Solo le stringhe passano da pd.to_datetime; date, datetime,
+        # Timestamp e np.datetime64 sono convertiti direttamente
+        if isinstance(value, str):
+            value = pd.to_datetime(value)
+        if pd.isna(value):
+            return cls.NAT_DAY
+        return np.datetime64(value, 'D').astype('i4')
+    
+    @classmethod
+    def _to_days(cls, dates):
+        """Converte date datetime64[D] in giorni dal 1970-01-01, con NAT_DAY per NaT"""
+        dates = np.asarray(dates, dtype='datetime64[D]')
+        return np.where(np.isnat(dates), cls.NAT_DAY, dates.astype('i8')).astype('i4')
+    
+    @classmethod
+    def _from_days(cls, days):
+        """Converte i giorni dal 1970-01-01 in datetime64[ns], con NaT per NAT_DAY"""
+        dates = days.astype('datetime64[D]')
+        dates[days == cls.NAT_DAY] = np.datetime64('NaT')
+        return dates.astype('datetime64[ns]')
+    
+    def _slot(self, id):
+        """Restituisce la posizione dell'attività con l'ID indicato, o None"""
+        slots = np.flatnonzero(self._cols['ID'][:self._n] == id)
+        return int(slots[0]) if len(slots) else None
+    
+    def _person_index(self, person):
+        """Restituisce le posizioni delle attività della persona indicata"""
+        code = self._person_codes.get(person)
+        if code is None:
+            return np.empty(0, dtype=np.intp)
+        return np.flatnonzero(self._cols['Persona_Riferimento'][:self._n] == code)
+    
+    @property
+    def df(self):
+        """DataFrame delle attività, costruito dagli array interni solo quando serve"""
+        if self._df_cache is None:
+            n = self._n
+            cols = self._cols
+            persons = pd.Categorical.from_codes(cols['Persona_Riferimento'][:n],
+                                                categories=self._persons)
+            self._df_cache = pd.DataFrame({
+                'ID': cols['ID'][:n],
+                'Nome_Attività': pd.array(cols['Nome_Attività'][:n], dtype='string'),
+                'Data_Inizio': self._from_days(cols['Data_Inizio'][:n]),
+                'Data_Fine': self._from_days(cols['Data_Fine'][:n]),
+                'Persona_Riferimento': persons.remove_unused_categories(),
+                'Stato': pd.Categorical.from_codes(cols['Stato'][:n], dtype=self.STATO_DTYPE)
+            }, copy=False)
+        return self._df_cache
+    
+    @df.setter
+    def df(self, value):
+        """Sostituisce le attività con quelle del DataFrame fornito"""
+        n = len(value)
+        self.initialize_dataframe(max(n, self.INITIAL_CAPACITY))
+        cols = self._cols
+        
+        # Assegna nuovi ID, dopo il massimo esistente, alle righe che ne sono prive
+        ids = pd.to_numeric(value['ID']).to_numpy(dtype='float64', na_value=np.nan, copy=True)
+        missing = np.isnan(ids)
+        next_id = int(ids[~missing].max()) + 1 if (~missing).any() else 1
+        if missing.any():
+            k = int(missing.sum())
+            print(f"Avviso: {k} attività senza ID, assegnati nuovi ID a partire da {next_id}.")
+            ids[missing] = np.arange(next_id, next_id + k)
+            next_id += k
+        cols['ID'][:n] = ids.astype('i4')
+        
+        cols['Nome_Attività'][:n] = value['Nome_Attività'].to_numpy(dtype=object)
+        cols['Data_Inizio'][:n] = self._to_days(pd.to_datetime(value['Data_Inizio']).to_numpy(dtype='datetime64[D]'))
+        cols['Data_Fine'][:n] = self._to_days(pd.to_datetime(value['Data_Fine']).to_numpy(dtype='datetime64[D]'))
+        codes, persons = pd.factorize(value['Persona_Riferimento'])
+        cols['Persona_Riferimento'][:n] = codes
+        self._persons = list(persons)
+        self._person_codes = {persona: code for code, persona in enumerate(self._persons)}
+        stati = pd.Categorical(value['Stato'], dtype=self.STATO_DTYPE)
+        unknown = value['Stato'][stati.isna() & value['Stato'].notna()].unique()
+        if len(unknown):
+            print(f"Avviso: Stati non validi ignorati: {', '.join(map(str, unknown))}.")
+        cols['Stato'][:n] = stati.codes
+        self._n = n
+        self._next_id = next_id
+        self._invalidate()
+    
+    @property
+    def display_df(self):
+        """DataFrame delle attività con le date formattate per la visualizzazione"""
+        if self._display_cache is None:
+            self._display_cache = self.df.assign(
+                Data_Inizio=lambda d: d['Data_Inizio'].dt.strftime('%d/%m/%Y'),
+                Data_Fine=lambda d: d['Data_Fine'].dt.strftime('%d/%m/%Y')
+            )
+        return self._display_cache
     
     def add_activity(self, nome, data_inizio, data_fine, persona, stato='In corso'):
         """
@@ -42,31 +214,85 @@ class GanttPrototype:
             persona: Persona di riferimento
             stato: Stato dell'attività (default: 'In corso')
         """
-        # Converti le date se sono stringhe
-        if isinstance(data_inizio, str):
-            data_inizio = pd.to_datetime(data_inizio)
-        if isinstance(data_fine, str):
-            data_fine = pd.to_datetime(data_fine)
+        if not self._valid_stato(stato):
+            print(f"Errore: Stato '{stato}' non valido.")
+            return False
+        
+        # Converti i valori prima di usare l'ID o scrivere negli array
+        start_day = self._encode('Data_Inizio', data_inizio)
+        end_day = self._encode('Data_Fine', data_fine)
+        stato_code = self._encode('Stato', stato)
+        person_code = self._encode('Persona_Riferimento', persona)
         
         # Genera un nuovo ID
-        if len(self.df) == 0:
-            new_id = 1
-        else:
-            new_id = self.df['ID'].max() + 1
-        
-        # Aggiungi la nuova attività
-        new_row = pd.DataFrame({
-            'ID': [new_id],
-            'Nome_Attività': [nome],
-            'Data_Inizio': [data_inizio],
-            'Data_Fine': [data_fine],
-            'Persona_Riferimento': [persona],
-            'Stato': [stato]
-        })
-        
-        self.df = pd.concat([self.df, new_row], ignore_index=True)
+        new_id = self._next_id
+        self._next_id += 1
+        
+        # Aggiungi la nuova attività nel primo posto libero
+        if self._n == self._cap:
+            self._grow()
+        i = self._n
+        cols = self._cols
+        cols['ID'][i] = new_id
+        cols['Nome_Attività'][i] = nome
+        cols['Data_Inizio'][i] = start_day
+        cols['Data_Fine'][i] = end_day
+        cols['Persona_Riferimento'][i] = person_code
+        cols['Stato'][i] = stato_code
+        self._n += 1
+        
+        self._invalidate()
         return new_id
     
+    def add_activities(self, rows):
+        """
+        Aggiunge più attività con un'unica scrittura per colonna.
+        
+        Args:
+            rows: Elenco di dizionari con le chiavi 'Nome_Attività', 'Data_Inizio',
+                'Data_Fine', 'Persona_Riferimento' e, opzionale, 'Stato' (default: 'In corso')
+        
+        Returns:
+            Elenco degli ID assegnati, nello stesso ordine delle righe,
+            oppure False se una riga ha uno stato non valido
+        """
+        rows = list(rows)
+        k = len(rows)
+        
+        for row in rows:
+            if not self._valid_stato(row.get('Stato', 'In corso')):
+                print(f"Errore: Stato '{row['Stato']}' non valido.")
+                return False
+        
+        # Converti tutte le righe prima di usare gli ID o scrivere negli array
+        names = [row['Nome_Attività'] for row in rows]
+        start_days = [self._to_day(row['Data_Inizio']) for row in rows]
+        end_days = [self._to_day(row['Data_Fine']) for row in rows]
+        stato_codes = [self._encode('Stato', row.get('Stato', 'In corso')) for row in rows]
+        persons = [row['Persona_Riferimento'] for row in rows]
+        person_codes = [self._encode('Persona_Riferimento', persona) for persona in persons]
+        
+        # Genera gli ID in blocco
+        start = self._next_id
+        self._next_id += k
+        
+        # Assicura spazio sufficiente negli array interni
+        while self._n + k > self._cap:
+            self._grow()
+        
+        slots = slice(self._n, self._n + k)
+        cols = self._cols
+        cols['ID'][slots] = np.arange(start, start + k)
+        cols['Nome_Attività'][slots] = names
+        cols['Data_Inizio'][slots] = start_days
+        cols['Data_Fine'][slots] = end_days
+        cols['Persona_Riferimento'][slots] = person_codes
+        cols['Stato'][slots] = stato_codes
+        self._n += k
+        
+        self._invalidate()
+        return list(range(start, start + k))
+    
     def update_activity(self, id, **kwargs):
         """
         Aggiorna un'attività esistente.
@@ -75,23 +301,37 @@ class GanttPrototype:
             id: ID dell'attività da aggiornare
             **kwargs: Coppie chiave-valore dei campi da aggiornare
         """
-        if id not in self.df['ID'].values:
+        i = self._slot(id)
+        if i is None:
             print(f"Errore: Attività con ID {id} non trovata.")
             return False
         
-        # Converti le date se sono stringhe
-        if 'Data_Inizio' in kwargs and isinstance(kwargs['Data_Inizio'], str):
-            kwargs['Data_Inizio'] = pd.to_datetime(kwargs['Data_Inizio'])
-        if 'Data_Fine' in kwargs and isinstance(kwargs['Data_Fine'], str):
-            kwargs['Data_Fine'] = pd.to_datetime(kwargs['Data_Fine'])
-        
-        # Aggiorna i campi
+        # Converti tutti i valori prima di scrivere, così un errore
+        # non lascia l'attività aggiornata solo in parte
+        encoded = {}
         for key, value in kwargs.items():
-            if key in self.df.columns:
-                self.df.loc[self.df['ID'] == id, key] = value
+            if key == 'ID' and value != id and self._slot(value) is not None:
+                print(f"Errore: ID {value} già assegnato a un'altra attività.")
+                return False
+            elif key == 'Stato' and not self._valid_stato(value):
+                print(f"Errore: Stato '{value}' non valido.")
+                return False
+            elif key in self._cols:
+                encoded[key] = self._encode(key, value)
             else:
                 print(f"Avviso: Campo '{key}' non presente nel DataFrame.")
         
+        # Aggiorna i campi su una copia della colonna, così i DataFrame
+        # già restituiti (che condividono la memoria) restano invariati
+        for key, value in encoded.items():
+            # Il contatore degli ID non deve riassegnare l'ID impostato
+            if key == 'ID':
+                self._next_id = max(self._next_id, int(value) + 1)
+            values = self._cols[key].copy()
+            values[i] = value
+            self._cols[key] = values
+        
+        self._invalidate()
         return True
     
     def delete_activity(self, id):
@@ -101,126 +341,205 @@ class GanttPrototype:
         Args:
             id: ID dell'attività da eliminare
         """
-        if id not in self.df['ID'].values:
+        i = self._slot(id)
+        if i is None:
             print(f"Errore: Attività con ID {id} non trovata.")
             return False
         
-        self.df = self.df[self.df['ID'] != id]
+        # Rimuove la riga mantenendo l'ordine delle attività
+        for col, values in self._cols.items():
+            self._cols[col] = np.delete(values, i)
+        self._cap -= 1
+        self._n -= 1
+        self._invalidate()
         return True
     
-    def save_to_excel(self, file_path):
+    def save_to_excel(self, target):
         """
         Salva il DataFrame in un file Excel.
         
         Args:
-            file_path: Percorso del file Excel
+            target: Percorso del file Excel oppure buffer binario (es. io.BytesIO)
         """
-        with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
+        with pd.ExcelWriter(target, engine='xlsxwriter') as writer:
             self.df.to_excel(writer, sheet_name='Attività', index=False)
-            
-            # Crea un foglio vuoto per il Gantt (sarà generato dinamicamente)
-            pd.DataFrame().to_excel(writer, sheet_name='GANTT', index=False)
         
-        print(f"File salvato: {file_path}")
-        return file_path
+        if not hasattr(target, 'write'):
+            print(f"File salvato: {target}")
+        return target
     
-    def generate_gantt(self, output_file, filter_person=None):
+    def generate_gantt(self, output_file=None, filter_person=None, dpi=None):
         """
         Genera un diagramma di Gantt basato sui dati delle attività.
         
         Args:
-            output_file: Percorso dove salvare l'immagine del diagramma di Gantt
+            output_file: Percorso dove salvare l'immagine del diagramma di Gantt (opzionale)
+            filter_person: Filtra le attività per persona di riferimento (opzionale)
+            dpi: Risoluzione dell'immagine (default: 150 se si salva su file,
+                altrimenti 72, adatta alla visualizzazione interattiva)
+        
+        Returns:
+            Percorso del file salvato se output_file è indicato, altrimenti
+            array RGBA (altezza x larghezza x 4) con l'immagine del diagramma
+        """
+        if output_file:
+            return self.export_png(output_file, filter_person, dpi or 150)
+        return self.render_gantt(filter_person, dpi or 72)
+    
+    def render_gantt(self, filter_person=None, dpi=72):
+        """
+        Genera il diagramma di Gantt in memoria, senza accedere al disco.
+        
+        Args:
             filter_person: Filtra le attività per persona di riferimento (opzionale)
+            dpi: Risoluzione dell'immagine (default: 72)
+        
+        Returns:
+            Array RGBA (altezza x larghezza x 4) con l'immagine del diagramma
+        """
+        # Riutilizza l'immagine se dati e filtro non sono cambiati
+        key = (filter_person or None, self._version, dpi)
+        image = self._render_cache.get(key)
+        if image is None:
+            image = self._render(filter_person, dpi)
+            if image is None:
+                return None
+            self._render_cache[key] = image
+        return image
+    
+    def export_png(self, output_file, filter_person=None, dpi=150):
         """
-        # Filtra il DataFrame se necessario
+        Salva il diagramma di Gantt in un file PNG.
+        
+        Args:
+            output_file: Percorso del file PNG
+            filter_person: Filtra le attività per persona di riferimento (opzionale)
+            dpi: Risoluzione dell'immagine (default: 150)
+        
+        Returns:
+            Percorso del file salvato, oppure None se non ci sono attività da visualizzare
+        """
+        image = self.render_gantt(filter_person, dpi)
+        if image is None:
+            return None
+        
+        import matplotlib.image as mpimg
+        mpimg.imsave(output_file, image, dpi=dpi)
+        print(f'Diagramma di Gantt salvato in: {output_file}')
+        return output_file
+    
+    def _render(self, filter_person=None, dpi=72):
+        """Disegna il diagramma di Gantt e restituisce i pixel RGBA dell'immagine"""
+        cols = self._cols
+        
+        # Filtra le attività se necessario
         if filter_person:
-            df_filtered = self.df[self.df['Persona_Riferimento'] == filter_person].copy()
+            idx = self._person_index(filter_person)
             title_suffix = f" - {filter_person}"
         else:
-            df_filtered = self.df.copy()
+            idx = np.arange(self._n)
             title_suffix = ""
         
+        # Le attività senza data di inizio o di fine non si possono disegnare
+        idx = idx[(cols['Data_Inizio'][idx] != self.NAT_DAY) & (cols['Data_Fine'][idx] != self.NAT_DAY)]
+        
         # Verifica che ci siano dati da visualizzare
-        if len(df_filtered) == 0:
+        if len(idx) == 0:
             print("Nessuna attività da visualizzare nel diagramma di Gantt.")
             return None
         
         # Ordina per data di inizio
-        df_filtered = df_filtered.sort_values('Data_Inizio')
+        idx = idx[np.argsort(cols['Data_Inizio'][idx], kind='stable')]
+        
+        # Matplotlib viene importato solo quando serve disegnare
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        import matplotlib.dates as mdates
+        from matplotlib.patches import Patch
+        
+        if GanttPrototype.LEGEND_ELEMENTS is None:
+            GanttPrototype.LEGEND_ELEMENTS = [Patch(facecolor=color, edgecolor='black', label=state)
+                                              for state, color in self.COLORI_STATI.items()]
+        
+        # Riutilizza la figura tra una chiamata e l'altra
+        if self._fig is None:
+            self._fig = Figure()
+            self._ax = self._fig.add_subplot()
+            self._canvas = FigureCanvasAgg(self._fig)
+            self._date_fmt = mdates.DateFormatter('%d/%m/%Y')
+            self._week_loc = mdates.WeekdayLocator(byweekday=0)
+        fig, ax = self._fig, self._ax
+        ax.clear()
         
-        # Crea la figura
-        fig, ax = plt.subplots(figsize=(12, 8))
+        # Adatta l'altezza al numero di attività
+        fig.set_size_inches(12, max(4, 0.25 * len(idx)))
+        fig.set_dpi(dpi)
         
         # Formatta l'asse x per le date
-        ax.xaxis.set_major_formatter(mdates.DateFormatter('%d/%m/%Y'))
-        ax.xaxis.set_major_locator(mdates.WeekdayLocator(byweekday=0))
-        plt.xticks(rotation=45)
-        
-        # Colori per gli stati
-        colori_stati = {
-            'Non iniziato': 'lightgrey',
-            'In corso': 'lightblue',
-            'Completato': 'lightgreen',
-            'In ritardo': 'salmon',
-            'In pausa': 'yellow'
-        }
-        
-        # Aggiungi barre per ogni attività
-        for i, task in df_filtered.iterrows():
-            start_date = task['Data_Inizio']
-            end_date = task['Data_Fine']
-            
-            # Calcola la durata in giorni
-            duration = (end_date - start_date).days
-            
-            # Colore basato sullo stato
-            color = colori_stati.get(task['Stato'], 'lightgrey')
-            
-            # Aggiungi la barra
-            ax.barh(task['Nome_Attività'], duration, left=start_date, 
-                    height=0.5, align='center', color=color, 
-                    alpha=0.8, edgecolor='black')
-            
-            # Aggiungi il nome della persona di riferimento
-            ax.text(end_date + timedelta(days=1), 
-                   task['Nome_Attività'], 
-                   task['Persona_Riferimento'], 
-                   va='center')
+        ax.xaxis.set_major_formatter(self._date_fmt)
+        ax.xaxis.set_major_locator(self._week_loc)
+        ax.tick_params(axis='x', labelrotation=45)
+        
+        # Estrai le attività da visualizzare direttamente dagli array interni
+        start_days = cols['Data_Inizio'][idx]
+        end_days = cols['Data_Fine'][idx]
+        names = cols['Nome_Attività'][idx]
+        # Le attività senza persona (codice -1) hanno un'etichetta vuota
+        persons = np.array(self._persons + [''], dtype=object)[cols['Persona_Riferimento'][idx]]
+        
+        # Calcola la durata in giorni
+        durations = end_days - start_days
+        
+        # Converti i giorni dal 1970-01-01 nei numeri di data di Matplotlib
+        epoch = mdates.date2num(np.datetime64('1970-01-01'))
+        starts = epoch + start_days
+        ends = epoch + end_days
+        
+        # Colore basato sullo stato (gli stati mancanti hanno codice -1)
+        colors = self._COLOR_LUT[cols['Stato'][idx]]
+        
+        # Aggiungi le barre di tutte le attività in un'unica chiamata
+        ax.barh(names, durations, left=starts,
+                height=0.5, align='center', color=colors,
+                alpha=0.8, edgecolor='black')
+        
+        # Aggiungi il nome della persona di riferimento
+        for end_date, name, person in zip(ends + 1, names, persons):
+            ax.text(end_date, name, person, va='center')
         
         # Aggiungi titolo e etichette
-        plt.title(f'Diagramma di Gantt{title_suffix}')
-        plt.xlabel('Data')
-        plt.ylabel('Attività')
+        ax.set_title(f'Diagramma di Gantt{title_suffix}')
+        ax.set_xlabel('Data')
+        ax.set_ylabel('Attività')
         
         # Aggiungi una legenda per gli stati
-        legend_elements = [Patch(facecolor=color, edgecolor='black', label=state)
-                          for state, color in colori_stati.items()]
-        ax.legend(handles=legend_elements, title='Stato', loc='upper right')
+        ax.legend(handles=self.LEGEND_ELEMENTS, title='Stato', loc='upper right')
         
         # Imposta i limiti dell'asse x
-        plt.xlim([
-            df_filtered['Data_Inizio'].min() - timedelta(days=3),
-            df_filtered['Data_Fine'].max() + timedelta(days=15)
+        ax.set_xlim([
+            starts.min() - 3,
+            ends.max() + 15
         ])
         
         # Aggiungi griglia
-        plt.grid(True, axis='x', alpha=0.3)
-        
-        # Salva il grafico
-        plt.tight_layout()
-        plt.savefig(output_file)
-        plt.close()
+        ax.grid(True, axis='x', alpha=0.3)
         
-        print(f'Diagramma di Gantt salvato in: {output_file}')
-        return output_file
+        # Disegna il grafico in memoria, senza codifica PNG
+        fig.tight_layout()
+        self._canvas.draw()
+        image = np.array(self._canvas.buffer_rgba())
+        image.flags.writeable = False
+        return image
     
     def get_unique_persons(self):
         """Restituisce l'elenco delle persone di riferimento uniche"""
-        return self.df['Persona_Riferimento'].unique().tolist()
+        if self._persons_cache is None:
+            self._persons_cache = self.df['Persona_Riferimento'].cat.categories.tolist()
+        return list(self._persons_cache)
     
     def get_activities_by_person(self, person):
         """Restituisce le attività filtrate per persona di riferimento"""
-        return self.df[self.df['Persona_Riferimento'] == person]
+        return self.df.iloc[self._person_index(person)]
 
 
 # Esempio di utilizzo
@@ -229,17 +548,24 @@ if __name__ == '__main__':
     gantt = GanttPrototype()
     
     # Aggiungi alcune attività di esempio
-    gantt.add_activity('Sviluppo frontend', '2024-05-01', '2024-05-15', 'Marco', 'In corso')
-    gantt.add_activity('Sviluppo backend', '2024-05-10', '2024-05-30', 'Laura', 'Non iniziato')
-    gantt.add_activity('Testing', '2024-05-25', '2024-06-05', 'Marco', 'Non iniziato')
-    gantt.add_activity('Documentazione', '2024-06-01', '2024-06-10', 'Giulia', 'Non iniziato')
-    gantt.add_activity('Deployment', '2024-06-10', '2024-06-15', 'Laura', 'Non iniziato')
+    gantt.add_activities([
+        {'Nome_Attività': 'Sviluppo frontend', 'Data_Inizio': '2024-05-01', 'Data_Fine': '2024-05-15',
+         'Persona_Riferimento': 'Marco', 'Stato': 'In corso'},
+        {'Nome_Attività': 'Sviluppo backend', 'Data_Inizio': '2024-05-10', 'Data_Fine': '2024-05-30',
+         'Persona_Riferimento': 'Laura', 'Stato': 'Non iniziato'},
+        {'Nome_Attività': 'Testing', 'Data_Inizio': '2024-05-25', 'Data_Fine': '2024-06-05',
+         'Persona_Riferimento': 'Marco', 'Stato': 'Non iniziato'},
+        {'Nome_Attività': 'Documentazione', 'Data_Inizio': '2024-06-01', 'Data_Fine': '2024-06-10',
+         'Persona_Riferimento': 'Giulia', 'Stato': 'Non iniziato'},
+        {'Nome_Attività': 'Deployment', 'Data_Inizio': '2024-06-10', 'Data_Fine': '2024-06-15',
+         'Persona_Riferimento': 'Laura', 'Stato': 'Non iniziato'}
+    ])
     
     # Salva in Excel
     gantt.save_to_excel('gantt_prototype.xlsx')
     
     # Genera il diagramma di Gantt completo
-    gantt.generate_gantt('gantt_completo.png')
+    gantt.export_png('gantt_completo.png')
     
     # Genera il diagramma di Gantt filtrato per persona
-    gantt.generate_gantt('gantt_marco.png', filter_person='Marco')
+    gantt.export_png('gantt_marco.png', filter_person='Marco')